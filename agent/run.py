@@ -12,15 +12,35 @@ import uuid
 from pathlib import Path
 from dataclasses import dataclass
 import os
+import shutil
 import requests
-import json
+import orjson
 import time
+import hashlib
+import struct
+import warnings
 from PIL import Image
 import math
-from PIL import ImageStat, ImageOps
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from PIL import ImageOps
+import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
+
+# Optional: PyTurboJPEG (libjpeg-turbo's SIMD decoder) speeds up the detail decode.
+# It also needs the libturbojpeg shared library; without either we use Pillow.
+try:
+    from turbojpeg import TurboJPEG, TJPF_GRAY, TJFLAG_STOPONWARNING
+    _turbojpeg = TurboJPEG()
+    # PyTurboJPEG reports libjpeg-turbo warnings (e.g. a truncated file) with
+    # warnings.warn only; raise them instead so damaged images are not scored.
+    # Set once here because catch_warnings() is not thread-safe.
+    warnings.filterwarnings("error", category=UserWarning, module="turbojpeg")
+except (ImportError, OSError, RuntimeError):
+    _turbojpeg = None
 
 @dataclass
 class AgentConfig:
@@ -33,6 +53,8 @@ class AgentConfig:
     candidates_to_download: int = 10
     sheets_to_generate: int = 3
     base_dir: str = "runs"
+    download_workers: int = 16
+    search_cache_ttl: int = 6 * 3600  # seconds; 0 disables the search cache
 
 def decide_plan(topic: str) -> str:
     """
@@ -43,11 +65,13 @@ def decide_plan(topic: str) -> str:
     """
     return f"Plan created for topic: {topic}"
 
+@lru_cache(maxsize=1)
 def tool_get_pexels_key() -> str:
     """
     Tool: read the Pexels API key from the environment.
 
     We do this via an environment variable so we do not hard-code secrets in code.
+    The key is looked up once and cached for the rest of the process.
     """
     key = os.environ.get("PEXELS_API_KEY")
     if not key:
@@ -56,6 +80,165 @@ def tool_get_pexels_key() -> str:
         )
     return key
 
+# Pexels "src" sizes to download, best first
+_PEXELS_SRC_KEYS = ("original", "large2x", "large")
+
+@lru_cache(maxsize=1)
+def _http_session(pool_size: int) -> requests.Session:
+    """
+    Shared HTTP session with connection pooling and a retry policy.
+
+    Built once per process, so keep-alive connections (and TLS sessions) are
+    reused by every request. Transient errors and 429s are retried by urllib3,
+    honouring Retry-After.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def _write_json(path: Path, obj, fsync: bool = False) -> None:
+    """
+    Write obj to path as pretty-printed JSON.
+
+    orjson encodes straight to UTF-8 bytes in C, several times faster than json.dumps,
+    and the bytes go out through a raw fd (no Python file object in between).
+    With fsync=True the data is flushed to disk before returning.
+    """
+    data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+
+    # O_BINARY only exists (and matters) on Windows
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _list_jpgs(folder: Path, prefix: str = "") -> list[Path]:
+    """
+    List the .jpg files in folder (optionally starting with prefix), sorted by name.
+
+    Uses a single os.scandir pass instead of Path.glob; the file-type check is
+    answered from the directory entry itself, so no extra stat() per file.
+    """
+    with os.scandir(folder) as it:
+        entries = sorted(
+            (
+                e for e in it
+                if e.name.startswith(prefix) and e.name.endswith(".jpg") and e.is_file(follow_symlinks=False)
+            ),
+            key=lambda e: e.name,
+        )
+    return [Path(e.path) for e in entries]
+
+def _place(src: Path, dst: Path) -> None:
+    """
+    Put src at dst without pushing the image bytes through Python.
+
+    Hardlinks when possible (no data written); otherwise falls back to
+    shutil.copyfile, which uses the kernel's copy path (sendfile etc.).
+    """
+    try:
+        os.link(src, dst)
+    except (OSError, NotImplementedError):
+        shutil.copyfile(src, dst)
+
+        # Later stages read the copy, so the source's cached pages are dead weight.
+        # (Not for hardlinks above: those share their pages with dst.)
+        try:
+            fd = os.open(src, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+        except (AttributeError, OSError):
+            pass  # posix_fadvise is Linux/BSD only; this is just a hint
+
+def _read_search_cache(cache_path: Path, ttl: int, allow_stale: bool = False) -> dict | None:
+    """
+    Return a cached Pexels search response if it is younger than ttl seconds.
+
+    With allow_stale=True an expired entry is returned too (used when offline).
+    Returns None when there is no usable cache entry or the cache is disabled.
+    """
+    if ttl <= 0:
+        return None
+
+    try:
+        if not allow_stale and cache_path.stat().st_mtime < time.time() - ttl:
+            return None
+        return orjson.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        # Missing or half-written cache file: just search again
+        return None
+
+def _is_transient_error(exc: requests.RequestException) -> bool:
+    """
+    True for failures a stale cache can paper over: network down, timeouts, exhausted
+    retries and 5xx responses. Client errors (bad key, bad request) are not transient.
+    """
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.RetryError)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code >= 500
+    return False
+
+def _fetch_one(session: requests.Session, raw_dir: Path, task: tuple) -> dict:
+    """
+    Download a single Pexels image into raw/.
+
+    Rate limits (429 + Retry-After) and transient errors are retried by the
+    session's urllib3 Retry policy.
+    Returns the manifest entry.
+    """
+    idx, photo, image_url = task
+
+    # Deterministic filename: pexels_0001.jpg, pexels_0002.jpg, ...
+    out_path = raw_dir / f"pexels_{idx:04d}.jpg"
+
+    # Stream the body straight to disk instead of holding the whole JPEG in memory
+    with session.get(image_url, timeout=60, stream=True) as img_resp:
+        img_resp.raise_for_status()
+        with out_path.open("wb") as f:
+            # Reserve the whole file up front so the filesystem can allocate one
+            # contiguous extent. Only when the body is not content-encoded, since
+            # then Content-Length is exactly the number of bytes we will write.
+            length = int(img_resp.headers.get("Content-Length") or 0)
+            if length and not img_resp.headers.get("Content-Encoding") and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, length)
+                except OSError:
+                    pass  # e.g. filesystem without fallocate support; not fatal
+
+            # Copy straight from the socket in 1 MiB blocks (decoding any
+            # Content-Encoding on the way, like iter_content would)
+            img_resp.raw.decode_content = True
+            shutil.copyfileobj(img_resp.raw, f, length=1 << 20)
+
+    return {
+        "index": idx,
+        # Pexels always returns these photo fields, so plain subscripts are safe
+        "pexels_id": photo["id"],
+        "photographer": photo["photographer"],
+        "width": photo["width"],
+        "height": photo["height"],
+        "page_url": photo["url"],
+        "image_url": image_url,
+        "local_file": str(out_path).replace("\\", "/"),
+    }
+
 def tool_download_pexels_images(config: AgentConfig, run_root: Path, api_key: str) -> list[Path]:
     """
     Tool: search Pexels for the topic and download N images.
@@ -67,22 +250,55 @@ def tool_download_pexels_images(config: AgentConfig, run_root: Path, api_key: st
     search_url = "https://api.pexels.com/v1/search"
     headers = {"Authorization": api_key}
 
-    # Pexels per_page max is typically 80; we fetch at most what we need.
-    per_page = min(80, max(1, config.candidates_to_download))
-    params = {"query": config.topic, "per_page": per_page}
+    # Pexels per_page max is typically 80; larger requests are fetched page by page.
+    wanted = max(1, config.candidates_to_download)
+    per_page = min(80, wanted)
+    pages = math.ceil(wanted / per_page)
 
-    resp = requests.get(search_url, headers=headers, params=params, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+    # One shared session: keep-alive connections are reused for the search and
+    # across all download workers. Pool size matches the worker count.
+    session = _http_session(config.download_workers)
+
+    # Reruns on the same topic reuse a recent search response (saves a round-trip)
+    cache_key = hashlib.sha1(f"{config.topic}|{wanted}".encode()).hexdigest()
+    cache_path = Path(config.base_dir) / ".cache" / "search" / f"{cache_key}.json"
+
+    data = _read_search_cache(cache_path, config.search_cache_ttl)
+    if data is None:
+        photos = []
+        try:
+            for page in range(1, pages + 1):
+                params = {"query": config.topic, "per_page": per_page, "page": page}
+                resp = session.get(search_url, headers=headers, params=params, timeout=30)
+                resp.raise_for_status()
+                page_photos = orjson.loads(resp.content).get("photos", [])
+                photos.extend(page_photos)
+
+                if len(page_photos) < per_page:
+                    break  # no more results for this topic
+        except requests.RequestException as e:
+            # Offline or Pexels is down: an expired cached search beats no run at all.
+            # A 401/403/400 is our fault, so it must not be hidden behind old results.
+            if not _is_transient_error(e):
+                raise
+            data = _read_search_cache(cache_path, config.search_cache_ttl, allow_stale=True)
+            if data is None:
+                raise
+        else:
+            data = {"photos": photos}
+
+            if config.search_cache_ttl > 0:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                _write_json(cache_path, data)
 
     photos = data.get("photos", [])
     if not photos:
         raise RuntimeError(f"No Pexels results for topic: {config.topic}")
 
-    # Take only N candidates
-    photos = photos[: config.candidates_to_download]
+    # Whole pages can overshoot N; take only N candidates
+    if len(photos) > wanted:
+        photos = photos[:wanted]
 
-    downloaded_paths: list[Path] = []
     manifest: dict = {
         "topic": config.topic,
         "requested": config.candidates_to_download,
@@ -93,199 +309,380 @@ def tool_download_pexels_images(config: AgentConfig, run_root: Path, api_key: st
     raw_dir = run_root / "raw"
     review_dir = run_root / "review"
 
-    session = requests.Session()
-
+    # Build the work list up front so downloads can run in parallel.
+    tasks = []
     for idx, photo in enumerate(photos, start=1):
         src = photo.get("src", {})
-        image_url = src.get("original") or src.get("large2x") or src.get("large")
-        if not image_url:
-            continue
-
-        # Deterministic filename: pexels_0001.jpg, pexels_0002.jpg, ...
-        out_path = raw_dir / f"pexels_{idx:04d}.jpg"
-
-        # Basic rate-limit / retry handling
-        for attempt in range(1, 4):
-            img_resp = session.get(image_url, timeout=60)
-
-            if img_resp.status_code == 429:
-                retry_after = img_resp.headers.get("Retry-After")
-                sleep_s = int(retry_after) if (retry_after and retry_after.isdigit()) else 5
-                time.sleep(sleep_s)
-                continue
-
-            img_resp.raise_for_status()
-            out_path.write_bytes(img_resp.content)
-            downloaded_paths.append(out_path)
-
-            manifest["items"].append(
-                {
-                    "index": idx,
-                    "pexels_id": photo.get("id"),
-                    "photographer": photo.get("photographer"),
-                    "width": photo.get("width"),
-                    "height": photo.get("height"),
-                    "page_url": photo.get("url"),
-                    "image_url": image_url,
-                    "local_file": str(out_path).replace("\\", "/"),
-                }
-            )
-            break
+        # Best available size, in order of preference
+        image_url = next((src[k] for k in _PEXELS_SRC_KEYS if src.get(k)), None)
+        if image_url:
+            tasks.append((idx, photo, image_url))
+
+    # Downloads are I/O-bound, so threads overlap the network waits.
+    # Results are collected as they finish. On the first failure the downloads that
+    # have not started yet are cancelled; the ones already running still finish
+    # (a thread cannot be interrupted) before the error is raised.
+    with ThreadPoolExecutor(max_workers=config.download_workers) as ex:
+        futures = [ex.submit(_fetch_one, session, raw_dir, task) for task in tasks]
+        try:
+            for future in as_completed(futures):
+                manifest["items"].append(future.result())
+        except Exception:
+            ex.shutdown(cancel_futures=True)
+            raise
 
-        # Gentle pacing (keeps you out of trouble even when not rate-limited)
-        time.sleep(0.4)
+    # Keep the manifest in search order
+    manifest["items"].sort(key=lambda item: item["index"])
+    downloaded_paths = [Path(item["local_file"]) for item in manifest["items"]]
 
     manifest["downloaded"] = len(downloaded_paths)
 
     manifest_path = review_dir / "pexels_manifest.json"
-    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    _write_json(manifest_path, manifest)
 
     return downloaded_paths
 
-def tool_screen_images(config: AgentConfig, run_root: Path) -> dict:
+# Start-of-frame markers (baseline, progressive, lossless, ...) that carry the image size.
+# 0xC4 (DHT), 0xC8 (JPG) and 0xCC (DAC) share the range but are not frames.
+_JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+}
+
+def _jpeg_size(img_path: Path) -> tuple[int, int]:
     """
-    Tool: screen downloaded images for basic quality.
+    Read (width, height) from a JPEG's SOFn header without decoding anything.
 
-    Copies passing images from raw/ -> ok/
-    Writes report to review/screening_report.json
-    Returns the report dict.
+    Walks the marker segments and seeks past each one, so only the header bytes
+    are read. Files without the JPEG signature (Pexels serves some PNG originals,
+    which we still save as .jpg) fall back to Pillow's lazy header read.
+    Raises ValueError if a JPEG has no frame header.
     """
-    raw_dir = run_root / "raw"
-    ok_dir = run_root / "ok"
-    review_dir = run_root / "review"
+    with open(img_path, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            # Not a JPEG; Image.open only parses the header until pixels are needed
+            with Image.open(img_path) as im:
+                return im.size
+
+        while True:
+            # Markers are 0xFF followed by a code; extra 0xFF bytes are padding
+            byte = f.read(1)
+            while byte and byte != b"\xff":
+                byte = f.read(1)
+            while byte == b"\xff":
+                byte = f.read(1)
+            if not byte:
+                raise ValueError("no JPEG frame header found")
+
+            marker = byte[0]
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                continue  # standalone markers have no length field
+            if marker in (0xD9, 0xDA):
+                raise ValueError("no JPEG frame header before image data")
+
+            header = f.read(2)
+            if len(header) != 2:
+                raise ValueError("truncated JPEG header")
+            (segment_len,) = struct.unpack(">H", header)
+
+            if marker in _JPEG_SOF_MARKERS:
+                frame = f.read(5)
+                if len(frame) != 5:
+                    raise ValueError("truncated JPEG frame header")
+                _precision, height, width = struct.unpack(">BHH", frame)
+                if not width or not height:
+                    raise ValueError("JPEG frame header has no size")
+                return width, height
+
+            f.seek(segment_len - 2, os.SEEK_CUR)
+
+# The detail score is computed on a plane fitted to this many pixels per side
+_DETAIL_SIZE = 512
+
+def _plane_detail_score(gray: Image.Image) -> float:
+    """
+    Stddev of a grayscale plane after fitting it to _DETAIL_SIZE.
 
-    min_short_side = 1600
-    max_aspect_ratio = 2.5  # e.g., reject very wide panoramas
+    The fixed bound keeps the score independent of the source's pixel size:
+    decoders hand back anything from 1x to 2x the target depending on it.
+    """
+    gray.thumbnail((_DETAIL_SIZE, _DETAIL_SIZE), Image.Resampling.BILINEAR)
+    arr = np.asarray(gray, dtype=np.uint8)
+    # stddev is a rough proxy for contrast/detail
+    return float(arr.std()) / 64.0  # scale roughly into ~0..2 range
 
-    report = {
-        "criteria": {
-            "min_short_side": min_short_side,
-            "max_aspect_ratio": max_aspect_ratio,
+def _detail_score(im: Image.Image) -> float:
+    """
+    Detail proxy: grayscale contrast (stddev) on a downscaled image.
+
+    draft() lets libjpeg decode straight to grayscale at 1/2, 1/4 or 1/8
+    scale, so we never materialize the full-resolution RGB pixels; the small
+    plane is then brought to a fixed size before taking the stddev.
+    """
+    im.draft("L", (_DETAIL_SIZE, _DETAIL_SIZE))
+    if im.mode != "L":
+        # draft() could not reach grayscale (e.g. CMYK JPEG); convert instead
+        im = ImageOps.grayscale(im)
+    return _plane_detail_score(im)
+
+def _shape_scores(entry: dict, target_ratios: list[float]) -> tuple[float, float]:
+    """
+    Cheap scores from a screening entry's width/height: (resolution, aspect).
+
+    No image is opened here.
+    """
+    ratio = entry["width"] / entry["height"]
+
+    # 1) Resolution score: normalize using log to reduce domination by huge images
+    res_score = math.log(entry["short_side"])
+
+    # 2) Aspect ratio score: closeness to any target ratio (higher is better)
+    ar_dist = min(abs(ratio - tr) for tr in target_ratios)
+    ar_score = 1 / (1 + ar_dist)  # in (0,1], closer => closer to 1
+
+    return res_score, ar_score
+
+def _score_entry(entry: dict, detail_score: float, target_ratios: list[float]) -> dict:
+    """
+    Build the scored row for a screening entry that passed (higher total is better).
+
+    Width/height come from the screening entry, so no image is reopened here.
+    """
+    w, h = entry["width"], entry["height"]
+    res_score, ar_score = _shape_scores(entry, target_ratios)
+
+    # 3) Detail score is computed by the caller from the decoded image
+    total = (res_score * 1.0) + (ar_score * 2.0) + (detail_score * 1.5)
+
+    return {
+        "file": entry["file"],
+        "width": w,
+        "height": h,
+        "short_side": entry["short_side"],
+        "ratio_w_over_h": round(w / h, 3),
+        "scores": {
+            "resolution": round(res_score, 3),
+            "aspect": round(ar_score, 3),
+            "detail": round(detail_score, 3),
         },
-        "passed": [],
-        "failed": [],
+        "total": round(total, 3),
     }
 
-    for img_path in sorted(raw_dir.glob("*.jpg")):
-        entry = {"file": img_path.name}
+def _screen_one(img_path: Path, ok_dir: Path, min_short_side: int, max_aspect_ratio: float) -> dict:
+    """
+    Screen a single raw image from its header alone; copy it into ok/ when it passes.
 
-        try:
-            with Image.open(img_path) as im:
-                width, height = im.size
-                short_side = min(width, height)
-                aspect_ratio = max(width, height) / short_side
-
-                entry.update(
-                    {
-                        "width": width,
-                        "height": height,
-                        "short_side": short_side,
-                        "aspect_ratio": round(aspect_ratio, 2),
-                    }
-                )
-
-                if short_side < min_short_side:
-                    entry["reason"] = "resolution_too_low"
-                    report["failed"].append(entry)
-                    continue
+    Returns the report entry. Failed entries carry a "reason" key.
+    """
+    entry = {"file": img_path.name}
+
+    try:
+        # Header-only: read the size from the JPEG markers (or the PNG header), no pixel decode
+        width, height = _jpeg_size(img_path)
+        short_side = min(width, height)
+        aspect_ratio = max(width, height) / short_side
+
+        entry.update(
+            {
+                "width": width,
+                "height": height,
+                "short_side": short_side,
+                "aspect_ratio": round(aspect_ratio, 2),
+            }
+        )
 
-                if aspect_ratio > max_aspect_ratio:
-                    entry["reason"] = "extreme_aspect_ratio"
-                    report["failed"].append(entry)
-                    continue
+        if short_side < min_short_side:
+            entry["reason"] = "resolution_too_low"
+            return entry
 
-                # Passed
-                target = ok_dir / img_path.name
-                target.write_bytes(img_path.read_bytes())
-                report["passed"].append(entry)
+        if aspect_ratio > max_aspect_ratio:
+            entry["reason"] = "extreme_aspect_ratio"
+            return entry
 
-        except Exception as e:
-            entry["reason"] = f"unreadable_image: {e}"
-            report["failed"].append(entry)
+        # Passed
+        _place(img_path, ok_dir / img_path.name)
+
+    except Exception as e:
+        entry["reason"] = f"unreadable_image: {e}"
+
+    return entry
 
-    report_path = review_dir / "screening_report.json"
-    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+def _turbo_detail_score(img_path: Path) -> float:
+    """
+    Same detail proxy as _detail_score, decoded with libjpeg-turbo.
 
-    return report
+    Decodes straight to grayscale at the largest 1/2, 1/4 or 1/8 DCT scale that
+    keeps both sides at least _DETAIL_SIZE (the same choice Pillow's draft() makes),
+    then fits the plane to the same fixed size so both paths score alike.
+    Raises on anything Pillow would refuse (oversized or damaged files), so the
+    caller can let Pillow report the error.
+    """
+    buf = img_path.read_bytes()
+    width, height = _turbojpeg.decode_header(buf)[:2]
+
+    # Same decompression-bomb limit Pillow applies before decoding
+    if Image.MAX_IMAGE_PIXELS and width * height > Image.MAX_IMAGE_PIXELS:
+        raise Image.DecompressionBombError(f"image size ({width}x{height}) exceeds MAX_IMAGE_PIXELS")
+
+    scale = min(width // _DETAIL_SIZE, height // _DETAIL_SIZE)
+    denom = next((k for k in (8, 4, 2) if k <= scale), 1)
+    # Stop at the first libjpeg-turbo warning (e.g. "Premature end of JPEG file");
+    # the filter set at import turns it into an exception
+    arr = _turbojpeg.decode(
+        buf, pixel_format=TJPF_GRAY, scaling_factor=(1, denom), flags=TJFLAG_STOPONWARNING
+    )
+    # TJPF_GRAY comes back as (h, w, 1); drop the channel axis for Pillow
+    return _plane_detail_score(Image.fromarray(arr[:, :, 0]))
+
+def _detail_one(img_path: Path) -> float:
+    """
+    Decode a single image and return its detail score.
 
-def tool_select_best_images(config: AgentConfig, run_root: Path) -> dict:
+    Uses libjpeg-turbo directly when available, else Pillow.
+    Raises Pillow's error if the pixels cannot be decoded.
+    """
+    if _turbojpeg is not None:
+        try:
+            return _turbo_detail_score(img_path)
+        except Exception:
+            pass  # let Pillow try (and report the error if it fails too)
+
+    with Image.open(img_path) as im:
+        return _detail_score(im)
+
+# Picks are stored at most this many pixels per side (plenty for the worksheet)
+_PICK_SIZE = 1000
+
+def _write_pick(src: Path, dst: Path) -> None:
+    """
+    Write src to dst as a JPEG no larger than _PICK_SIZE per side.
+
+    Shrinking once here means the renderer can embed picks without re-decoding
+    full-resolution originals. draft() keeps the decode at a reduced DCT scale.
+    """
+    with Image.open(src) as im:
+        im.draft("RGB", (_PICK_SIZE, _PICK_SIZE))
+        if im.mode != "RGB":
+            im = im.convert("RGB")
+        im.thumbnail((_PICK_SIZE, _PICK_SIZE))
+        im.save(dst, "JPEG", quality=85, optimize=True, progressive=True)
+
+def tool_process_images(config: AgentConfig, run_root: Path) -> tuple[dict, dict]:
     """
-    Tool: select the best images from ok/ and copy to picks/.
+    Tool: screen downloaded images and select the best ones.
 
-    Writes review/selection_report.json
-    Returns the report dict.
+    Screening and the cheap resolution/aspect scores use image headers only;
+    pixels are decoded just for a shortlist of likely winners.
+    Copies passing images from raw/ -> ok/ and downscaled best ones to picks/.
+    Writes review/screening_report.json and review/selection_report.json
+    Returns (screening report, selection report).
     """
+    raw_dir = run_root / "raw"
     ok_dir = run_root / "ok"
     picks_dir = run_root / "picks"
     review_dir = run_root / "review"
 
+    min_short_side = 1600
+    max_aspect_ratio = 2.5  # e.g., reject very wide panoramas
+
     target_count = max(1, config.sheets_to_generate)
 
     # Portrait-friendly target ratios (w/h). We'll reward closeness.
     target_ratios = [4/5, 3/4, 2/3]
 
-    scored = []
+    # Only this many images (best by cheap score) get the expensive detail decode
+    shortlist_size = 2 * target_count
 
-    for img_path in sorted(ok_dir.glob("*.jpg")):
-        with Image.open(img_path) as im:
-            w, h = im.size
-            short_side = min(w, h)
-            ratio = w / h
-
-            # 1) Resolution score: normalize using log to reduce domination by huge images
-            res_score = math.log(short_side)
-
-            # 2) Aspect ratio score: closeness to any target ratio (higher is better)
-            ar_dist = min(abs(ratio - tr) for tr in target_ratios)
-            ar_score = 1 / (1 + ar_dist)  # in (0,1], closer => closer to 1
-
-            # 3) Detail proxy: grayscale contrast (stddev) on a resized copy
-            thumb = im.copy()
-            thumb.thumbnail((800, 800))
-            gray = ImageOps.grayscale(thumb)
-            stat = ImageStat.Stat(gray)
-            # stddev is a rough proxy for contrast/detail
-            detail_score = stat.stddev[0] / 64.0  # scale roughly into ~0..2 range
-
-            total = (res_score * 1.0) + (ar_score * 2.0) + (detail_score * 1.5)
-
-            scored.append(
-                {
-                    "file": img_path.name,
-                    "width": w,
-                    "height": h,
-                    "short_side": short_side,
-                    "ratio_w_over_h": round(ratio, 3),
-                    "scores": {
-                        "resolution": round(res_score, 3),
-                        "aspect": round(ar_score, 3),
-                        "detail": round(detail_score, 3),
-                    },
-                    "total": round(total, 3),
-                }
-            )
+    screening = {
+        "criteria": {
+            "min_short_side": min_short_side,
+            "max_aspect_ratio": max_aspect_ratio,
+        },
+        "passed": [],
+        "failed": [],
+    }
+
+    # Pass 1: header-only screening. Nothing is decoded here: the JPEG marker walk is
+    # Python code that holds the GIL, so the threads only overlap the file reads and
+    # the os.link / copy into ok/
+    screen = partial(_screen_one, ok_dir=ok_dir, min_short_side=min_short_side, max_aspect_ratio=max_aspect_ratio)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        entries = list(ex.map(screen, _list_jpgs(raw_dir)))
+
+    for entry in entries:
+        if "reason" in entry:
+            screening["failed"].append(entry)
+        else:
+            screening["passed"].append(entry)
+
+    def cheap_total(entry: dict) -> float:
+        res_score, ar_score = _shape_scores(entry, target_ratios)
+        return (res_score * 1.0) + (ar_score * 2.0)
+
+    # Best cheap score first; shortlisted images that fail to decode are replaced by the
+    # next candidates in this order, so a few corrupt files cannot empty the selection
+    candidates = sorted(screening["passed"], key=cheap_total, reverse=True)
+
+    # Pass 2: decode pixels until shortlist_size images have scored (or we run out).
+    # Threads suffice because libjpeg decoding, resizing and NumPy reductions all
+    # release the GIL (and unlike processes there is nothing to spawn or pickle)
+    scored = []
+    next_idx = 0
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        while len(scored) < shortlist_size and next_idx < len(candidates):
+            batch = candidates[next_idx:next_idx + shortlist_size - len(scored)]
+            next_idx += len(batch)
+            futures = [ex.submit(_detail_one, ok_dir / entry["file"]) for entry in batch]
+
+            for entry, future in zip(batch, futures):
+                try:
+                    detail = future.result()
+                except Exception as e:
+                    # Header was fine but the pixel data is not; report it as a failure
+                    screening["passed"].remove(entry)
+                    entry["reason"] = f"unreadable_image: {e}"
+                    screening["failed"].append(entry)
+                    continue
+                scored.append(_score_entry(entry, detail, target_ratios))
 
     scored.sort(key=lambda x: x["total"], reverse=True)
 
-    selected = scored[:target_count]
+    # Write downscaled copies of the best files into picks/ with deterministic names.
+    # If a full-color decode fails, that row is dropped and the next scored row moves up
+    selected = []
+    for item in list(scored):
+        if len(selected) == target_count:
+            break
+
+        dst = picks_dir / f"pick_{len(selected) + 1:02d}.jpg"
+        try:
+            _write_pick(ok_dir / item["file"], dst)
+        except Exception as e:
+            dst.unlink(missing_ok=True)  # don't leave a half-written pick for the renderer
+            scored.remove(item)
+            entry = next(entry for entry in screening["passed"] if entry["file"] == item["file"])
+            screening["passed"].remove(entry)
+            entry["reason"] = f"unreadable_image: {e}"
+            screening["failed"].append(entry)
+            continue
 
-    # Copy selected files into picks/ with deterministic names
-    for i, item in enumerate(selected, start=1):
-        src = ok_dir / item["file"]
-        dst = picks_dir / f"pick_{i:02d}.jpg"
-        dst.write_bytes(src.read_bytes())
         item["picked_as"] = dst.name
+        selected.append(item)
 
     report = {
         "topic": config.topic,
         "target_count": target_count,
-        "selected": selected,
-        "all_scored": scored,
+        "shortlist_size": shortlist_size,
+        # Selected rows live in "scored" (with "picked_as"); list them by name only
+        "selected_files": [item["file"] for item in selected],
+        "scored": scored,  # the shortlist only; every passing image is in the screening report
     }
 
+    screening_path = review_dir / "screening_report.json"
+    _write_json(screening_path, screening)
+
     report_path = review_dir / "selection_report.json"
-    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
-    return report
+    _write_json(report_path, report)
+    return screening, report
 
 def tool_render_worksheet_pdfs(config: AgentConfig, run_root: Path) -> list[Path]:
     """
@@ -316,17 +713,51 @@ def tool_render_worksheet_pdfs(config: AgentConfig, run_root: Path) -> list[Path
         ("Finish", "Drawing is clean; details support the main form."),
     ]
 
-    pick_files = sorted(picks_dir.glob("pick_*.jpg"))
+    pick_files = _list_jpgs(picks_dir, prefix="pick_")
     if not pick_files:
         raise RuntimeError("No picks found. Run selection first.")
 
+    # Margins and layout constants (points). The layout is identical on every
+    # sheet, so it is computed once here rather than per page.
+    margin = 36  # 0.5"
+    top_y = page_h - margin
+
+    # Reference image box (top-left)
+    img_box_w = 240
+    img_box_h = 180
+    img_x = margin
+    img_y = top_y - 16 - 14 - img_box_h  # below header
+
+    # Tips box (top-right)
+    tips_x = img_x + img_box_w + 24
+    tips_w = page_w - margin - tips_x
+    tips_h = img_box_h
+    tips_y = img_y
+
+    # Drawing space (big box)
+    draw_box_x = margin
+    draw_box_y = margin + 140  # leave space for rubric at bottom
+    draw_box_w = page_w - 2 * margin
+    draw_box_h = (img_y - 24) - draw_box_y  # between top area and rubric
+
+    # Rubric box (bottom)
+    rubric_x = margin
+    rubric_y = margin
+    rubric_w = page_w - 2 * margin
+    rubric_h = 120
+    sx = rubric_x + rubric_w - 120  # score boxes
+
+    # Text lines and score boxes are static too: precompute what gets drawn where
+    tip_lines = [(tips_y + tips_h - 34 - k * 14, f"• {t}") for k, t in enumerate(tips)]
+    rubric_lines = [
+        (rubric_y + rubric_h - 36 - k * 18, f"{name}: {desc}") for k, (name, desc) in enumerate(rubric)
+    ]
+    score_box_xs = [sx + k * 18 for k in range(5)]
+
     for i, img_path in enumerate(pick_files, start=1):
         pdf_path = sheets_dir / f"worksheet_{i:02d}.pdf"
-        c = canvas.Canvas(str(pdf_path), pagesize=letter)
-
-        # Margins and layout constants (points)
-        margin = 36  # 0.5"
-        top_y = page_h - margin
+        # Compressed page streams; invariant output (no timestamps) for identical reruns
+        c = canvas.Canvas(str(pdf_path), pagesize=letter, pageCompression=1, invariant=1)
 
         # Header
         c.setFont("Helvetica-Bold", 16)
@@ -335,71 +766,48 @@ def tool_render_worksheet_pdfs(config: AgentConfig, run_root: Path) -> list[Path
         c.setFont("Helvetica", 10)
         c.drawString(margin, top_y - 16, f"Reference: {img_path.name}")
 
-        # Reference image box (top-left)
-        img_box_w = 240
-        img_box_h = 180
-        img_x = margin
-        img_y = top_y - 16 - 14 - img_box_h  # below header
-
+        # Reference image box
         c.setLineWidth(1)
         c.rect(img_x, img_y, img_box_w, img_box_h)
 
-        # Draw image fit-in-box (preserve aspect)
-        with Image.open(img_path) as im:
-            iw, ih = im.size
+        # Draw image fit-in-box (preserve aspect). Picks are already small JPEGs,
+        # so reportlab embeds the file bytes as-is without decoding them.
+        iw, ih = _jpeg_size(img_path)
         scale = min(img_box_w / iw, img_box_h / ih)
         draw_w = iw * scale
         draw_h = ih * scale
         dx = img_x + (img_box_w - draw_w) / 2
         dy = img_y + (img_box_h - draw_h) / 2
-        c.drawImage(ImageReader(str(img_path)), dx, dy, draw_w, draw_h, preserveAspectRatio=True, mask='auto')
-
-        # Tips box (top-right)
-        tips_x = img_x + img_box_w + 24
-        tips_w = page_w - margin - tips_x
-        tips_h = img_box_h
-        tips_y = img_y
+        c.drawImage(str(img_path), dx, dy, draw_w, draw_h, preserveAspectRatio=True, mask='auto')
 
+        # Tips box
         c.rect(tips_x, tips_y, tips_w, tips_h)
         c.setFont("Helvetica-Bold", 12)
         c.drawString(tips_x + 10, tips_y + tips_h - 18, "Tips (do these first)")
 
         c.setFont("Helvetica", 10)
-        ty = tips_y + tips_h - 34
-        for t in tips:
-            c.drawString(tips_x + 10, ty, f"• {t}")
-            ty -= 14
-
-        # Drawing space (big box)
-        draw_box_x = margin
-        draw_box_y = margin + 140  # leave space for rubric at bottom
-        draw_box_w = page_w - 2 * margin
-        draw_box_h = (img_y - 24) - draw_box_y  # between top area and rubric
+        for ty, line in tip_lines:
+            c.drawString(tips_x + 10, ty, line)
+
+        # Drawing space
         c.rect(draw_box_x, draw_box_y, draw_box_w, draw_box_h)
 
         c.setFont("Helvetica-Oblique", 10)
         c.drawString(draw_box_x + 10, draw_box_y + draw_box_h - 16, "Drawing space (light construction lines first)")
 
-        # Rubric box (bottom)
-        rubric_x = margin
-        rubric_y = margin
-        rubric_w = page_w - 2 * margin
-        rubric_h = 120
+        # Rubric box
         c.rect(rubric_x, rubric_y, rubric_w, rubric_h)
 
         c.setFont("Helvetica-Bold", 12)
         c.drawString(rubric_x + 10, rubric_y + rubric_h - 18, "Self-Critique Rubric (0–4 each)")
 
         c.setFont("Helvetica", 9)
-        ry = rubric_y + rubric_h - 36
-        for name, desc in rubric:
-            c.drawString(rubric_x + 10, ry, f"{name}: {desc}")
+        for ry, line in rubric_lines:
+            c.drawString(rubric_x + 10, ry, line)
             # score boxes
-            sx = rubric_x + rubric_w - 120
             c.drawString(sx - 40, ry, "Score:")
-            for k in range(5):
-                c.rect(sx + k * 18, ry - 8, 14, 14)
-            ry -= 18
+            for bx in score_box_xs:
+                c.rect(bx, ry - 8, 14, 14)
 
         c.setFont("Helvetica-Oblique", 9)
         c.drawString(rubric_x + 10, rubric_y + 10, "Optional: write 1 improvement and 1 strength on the back.")
@@ -425,21 +833,20 @@ def tool_write_approval_placeholder(run_root: Path) -> Path:
     }
 
     path = review_dir / "approval.json"
-    path.write_text(json.dumps(approval, indent=2), encoding="utf-8")
+    # This is the file a human edits, so make sure it actually hits the disk
+    _write_json(path, approval, fsync=True)
     return path
 
 def tool_generate_run_id(config: AgentConfig) -> str:
     """
-    Tool: create a unique run id and ensure the run folder exists.
+    Tool: create a unique run id.
 
+    The run folder itself is created by tool_create_run_folders.
     Returns the run_id string.
     """
     timestamp = datetime.datetime.now().strftime("%Y-%m-%dT%H%M%S")
     run_id = f"{timestamp}_{uuid.uuid4().hex[:8]}"
 
-    run_path = Path(config.base_dir) / run_id
-    run_path.mkdir(parents=True, exist_ok=True)
-
     return run_id
 
 def tool_create_run_folders(config: AgentConfig, run_id: str) -> Path:
@@ -449,9 +856,11 @@ def tool_create_run_folders(config: AgentConfig, run_id: str) -> Path:
     Returns the Path to the run root folder (runs/<run_id>/).
     """
     run_root = Path(config.base_dir) / run_id
+    run_root.mkdir(parents=True, exist_ok=True)
 
+    # The parent exists now, so each subfolder is a single mkdir
     for name in ["raw", "ok", "picks", "sheets", "review"]:
-        (run_root / name).mkdir(parents=True, exist_ok=True)
+        (run_root / name).mkdir(exist_ok=True)
 
     return run_root
 
@@ -479,12 +888,11 @@ def main():
     print(f"Downloaded {len(downloaded_images)} images")
     print(f"Manifest: {run_root / 'review' / 'pexels_manifest.json'}")
 
-    screening = tool_screen_images(config, run_root)
+    screening, selection = tool_process_images(config, run_root)
     print(f"Screened images — passed: {len(screening['passed'])}, failed: {len(screening['failed'])}")
     print(f"Screening report: {run_root / 'review' / 'screening_report.json'}")
 
-    selection = tool_select_best_images(config, run_root)
-    print(f"Selected {len(selection['selected'])} picks")
+    print(f"Selected {len(selection['selected_files'])} picks")
     print(f"Selection report: {run_root / 'review' / 'selection_report.json'}")
 
     pdfs = tool_render_worksheet_pdfs(config, run_root)